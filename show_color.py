@@ -9,6 +9,10 @@ It includes two comprehensive dictionaries:
 Functionality:
 - The script enables querying color names dynamically from their RGB tuples.
 - It includes a utility function, `get_color_name_from_rgb(rgb)`, to retrieve the name of a color.
+- `get_color_names_from_rgb(rgb)` returns every name sharing an RGB value across both dictionaries.
+- `nearest_color_name(rgb)` returns the (approximately) closest named color for RGB values that are not in the tables;
+  `nearest_color_names(rgbs)` does the same for many RGB values at once, and
+  `nearest_color_name_bucketed(rgb)` for one RGB value using a spatial grid over the palette.
 - The `label_colors_with_names` function labels PyMOL objects or residues with their respective color names.
 
 Key Features:
@@ -27,6 +31,7 @@ Example:
 
 Dependencies:
 - This script requires PyMOL's `cmd` module to function correctly.
+- NumPy (shipped with PyMOL) is used for nearest-color matching, which is done in CIE L*a*b*.
 
 Customization:
 - Add more colors or chemical elements to the respective dictionaries as needed.
@@ -61,6 +66,11 @@ THE SOFTWARE.
 
 """
 
+from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
 from pymol import cmd, stored
 
 
@@ -260,31 +270,208 @@ reverse_chemical_element_colors = {
     (0.580, 0.878, 0.878): "zirconium",
 }
 
-# Just combine them
-combined_reverse_colors = {**reverse_simple_named_colors, **reverse_chemical_element_colors}
+# Just combine them (read-only: the lookup tables below are built from the dictionaries above)
+combined_reverse_colors = MappingProxyType({**reverse_simple_named_colors, **reverse_chemical_element_colors})
+
+def _rgb_key(rgb):
+    """
+    Packs an RGB tuple into a single int at 3-decimal precision (10 bits per channel),
+    so the key still fits in 32 bits. 8 bits per channel (RGB888) is too coarse for
+    these tables: it merges e.g. hydrogen (0.9, 0.9, 0.9) with scandium (0.902, 0.902, 0.902).
+    """
+    r, g, b = rgb
+    return int(round(r * 1000)) << 20 | int(round(g * 1000)) << 10 | int(round(b * 1000))
+
+# The palette, stored as arrays (one row per distinct RGB), plus packed RGB -> palette row.
+# Unlike the merged dict above, this keeps every name when the two tables share an RGB;
+# element names come first, matching which name wins in combined_reverse_colors.
+_int_table = {}
+_pal_rows = []
+_PAL_NAME_LISTS = []
+for _table in (reverse_chemical_element_colors, reverse_simple_named_colors):
+    for _rgb, _name in _table.items():
+        _i = _int_table.setdefault(_rgb_key(_rgb), len(_pal_rows))
+        if _i == len(_pal_rows):
+            _pal_rows.append(_rgb)
+            _PAL_NAME_LISTS.append([])
+        if _name not in _PAL_NAME_LISTS[_i]:
+            _PAL_NAME_LISTS[_i].append(_name)
+_PAL_RGB = np.asarray(_pal_rows, dtype=np.float32)
+_PAL_NAMES = [names[0] for names in _PAL_NAME_LISTS]
+del _table, _rgb, _name, _i, _pal_rows
 
 def get_color_name_from_rgb(rgb):
     """
     Returns the name of the color for a given RGB tuple.
     If the RGB tuple is not found, returns 'Unknown'.
     """
-    return combined_reverse_colors.get(tuple(round(c, 3) for c in rgb), "Unknown")
+    i = _int_table.get(_rgb_key(rgb))
+    return "Unknown" if i is None else _PAL_NAMES[i]
 
-def label_colors_with_names():
+def get_color_names_from_rgb(rgb):
+    """
+    Returns all names sharing a given RGB tuple (e.g. both 'carbon' and 'tv_green').
+    If the RGB tuple is not found, returns an empty list.
+    """
+    i = _int_table.get(_rgb_key(rgb))
+    return [] if i is None else list(_PAL_NAME_LISTS[i])
+
+# sRGB (D65) -> CIE XYZ, and the D65 reference white
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+def _rgb_to_lab(rgb):
+    """
+    Converts an (..., 3) array of sRGB values in [0, 1] to CIE L*a*b* (float32).
+    Distances in L*a*b* follow perceived color differences much more closely than in RGB.
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    linear = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lab = np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+    return lab.astype(np.float32)
+
+# All nearest-color matching is done on the palette in L*a*b*
+_PAL_LAB = _rgb_to_lab(_PAL_RGB)
+
+# Quantized RGB cube (32 levels per channel) -> index of the nearest palette color
+_LUT_SIZE = 32
+
+def _build_nearest_lut(palette, size=_LUT_SIZE):
+    """
+    Builds a (size, size, size) table holding, for each quantized RGB,
+    the index of the nearest color of an L*a*b* palette.
+    """
+    levels = np.arange(size, dtype=np.float32) / (size - 1)
+    gb = np.stack(np.meshgrid(levels, levels, indexing="ij"), axis=-1).reshape(-1, 2)
+    # Narrowest index type for the palette: uint8 for the stock tables, wider if colors are added
+    lut = np.empty((size, size, size), dtype=np.min_scalar_type(len(palette) - 1))
+    # One red slice at a time keeps the distance matrix small
+    for i, r in enumerate(levels):
+        centers = _rgb_to_lab(np.column_stack([np.full(len(gb), r, dtype=np.float32), gb]))
+        dist = ((centers[:, None, :] - palette[None, :, :]) ** 2).sum(-1)
+        lut[i] = dist.argmin(axis=1).reshape(size, size)
+    return lut
+
+@lru_cache(maxsize=None)
+def _nearest_lut():
+    """
+    The lookup table for `nearest_color_name`, built on first use rather than at import
+    since building it dominates the time to load this script.
+    """
+    return _build_nearest_lut(_PAL_LAB)
+
+def nearest_color_name(rgb):
+    """
+    Returns the name of the palette color closest to a given RGB tuple.
+    Unlike `get_color_name_from_rgb`, this never returns 'Unknown'.
+    Exact palette colors always get their own name; for other RGB values the answer comes
+    from a 32-level quantized table and is approximate (use `nearest_color_names` for
+    the exact nearest color).
+    """
+    i = _int_table.get(_rgb_key(rgb))
+    if i is not None:
+        return _PAL_NAMES[i]
+    n = _LUT_SIZE - 1
+    return _PAL_NAMES[_nearest_lut()[int(round(rgb[0] * n)), int(round(rgb[1] * n)), int(round(rgb[2] * n))]]
+
+# Query rows per distance pass; bounds the (chunk, P, 3) temporary to a few MB
+_NEAREST_CHUNK = 4096
+
+def _nearest_palette_indices(query, palette, chunk=_NEAREST_CHUNK):
+    """
+    Returns, for each row of an (N, 3) float32 array, the index of the
+    nearest row of an (P, 3) float32 palette as an (N,) int32 array.
+    """
+    out = np.empty(len(query), dtype=np.int32)
+    # A fixed number of query rows at a time keeps the distance matrix small
+    for start in range(0, len(query), chunk):
+        block = query[start:start + chunk]
+        dist = ((block[:, None, :] - palette[None, :, :]) ** 2).sum(-1)
+        out[start:start + chunk] = dist.argmin(axis=1)
+    return out
+
+def nearest_color_names(rgbs):
+    """
+    Returns the names of the palette colors closest to each of a sequence of RGB tuples.
+    """
+    query = _rgb_to_lab(np.asarray(rgbs, dtype=np.float32).reshape(-1, 3))
+    return [_PAL_NAMES[i] for i in _nearest_palette_indices(query, _PAL_LAB)]
+
+# Palette rows (index, L*, a*, b*) bucketed on a 16x16x16 grid over L* in [0, 100] and
+# a*, b* in [-128, 128], for nearest-color queries that only compare against the
+# palette colors around the query
+_BUCKET_LEVELS = 15
+_BUCKET_LO = (0.0, -128.0, -128.0)
+_BUCKET_SCALE = (_BUCKET_LEVELS / 100.0, _BUCKET_LEVELS / 256.0, _BUCKET_LEVELS / 256.0)
+# Narrowest bucket edge; anything outside a bucket's neighborhood is at least this far away
+_BUCKET_WIDTH = 100.0 / _BUCKET_LEVELS
+
+def _bucket_of(lab):
+    # Unrolled over the three channels; this runs for every bucketed query
+    return (
+        int((lab[0] - _BUCKET_LO[0]) * _BUCKET_SCALE[0]),
+        int((lab[1] - _BUCKET_LO[1]) * _BUCKET_SCALE[1]),
+        int((lab[2] - _BUCKET_LO[2]) * _BUCKET_SCALE[2]),
+    )
+
+_BUCKETS = defaultdict(list)
+for _i, _lab in enumerate(_PAL_LAB.tolist()):
+    _BUCKETS[_bucket_of(_lab)].append((_i, *_lab))
+del _i, _lab
+
+def nearest_color_name_bucketed(rgb):
+    """
+    Returns the name of the palette color closest to a given RGB tuple,
+    searching only the grid bucket of the color and its 26 neighbors.
+    """
+    lab = _rgb_to_lab(rgb).tolist()
+    l, a, b = lab
+    bl, ba, bb = _bucket_of(lab)
+    best, best_i = float("inf"), -1
+    for dl in (-1, 0, 1):
+        for da in (-1, 0, 1):
+            for db in (-1, 0, 1):
+                for i, pl, pa, pb in _BUCKETS.get((bl + dl, ba + da, bb + db), ()):
+                    d = (l - pl) ** 2 + (a - pa) ** 2 + (b - pb) ** 2
+                    if d < best:
+                        best, best_i = d, i
+    # If nothing within one bucket width was found, fall back to the full palette
+    if best > _BUCKET_WIDTH ** 2:
+        return nearest_color_names([rgb])[0]
+    return _PAL_NAMES[best_i]
+
+def label_colors_with_names(nearest=0):
     """
     Labels residues or objects in PyMOL with their color names.
+    With nearest=1, colors missing from the tables are labeled with the closest named color.
     """
+    nearest = int(nearest)
+    # Fetch (object, index, color index) for all atoms, regardless of state
     stored.atom_list = []
-    cmd.iterate("all", "stored.atom_list.append([model, index, color])")
+    cmd.iterate("all", "stored.atom_list.append((model, index, color))")
+    atom_list = stored.atom_list
+
+    # Get RGB tuple and name for each distinct color index, so each is resolved only once
+    rgbs = {color_index: cmd.get_color_tuple(color_index) for color_index in {c for _, _, c in atom_list}}
+    names = {color_index: get_color_name_from_rgb(rgb) for color_index, rgb in rgbs.items()}
 
-    for model, resi, color_index in stored.atom_list:
-        # Get RGB tuple for this color index
-        rgb = cmd.get_color_tuple(color_index)
-        color_name = get_color_name_from_rgb(rgb)
+    # Resolve all unknown colors against the palette in a single batch
+    unknown = [color_index for color_index, name in names.items() if name == "Unknown"]
+    if nearest and unknown:
+        for color_index, name in zip(unknown, nearest_color_names([rgbs[c] for c in unknown])):
+            names[color_index] = name
 
-        # Label the residue or object
-        resi_selection = f"model {model} and index {resi}"
-        cmd.label(resi_selection, f"'{color_name}'")
+    # Label all atoms with a single alter pass
+    stored.labels = {(model, resi): names[color_index] for model, resi, color_index in atom_list}
+    cmd.alter("all", "label=stored.labels.get((model, index), '')")
+    # alter only sets the text; cmd.label also made the labels visible
+    cmd.show("labels", "all")
 
     print("Residues labeled with their color names.")
 